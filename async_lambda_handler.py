@@ -3,7 +3,6 @@ Dedicated Lambda handler for async image processing
 This bypasses Zappa completely for image generation tasks
 """
 
-import json
 import logging
 import os
 import sys
@@ -12,33 +11,44 @@ import sys
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Setup Django environment once per container, during the cold-start init phase.
+# The worker settings register only the generator app, so the admin, auth,
+# sessions and staticfiles apps are never loaded here
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings_async')
+
+# Add current directory to path so Django can find our apps
+sys.path.insert(0, '/var/task')
+
+import django
+django.setup()
+
+# Import our async handler (only after django.setup() has populated the app registry)
+from async_handler import process_images_async, process_post_async
+from generator.services import image_pipeline
+
+# Pre-import the pipeline and create its Bedrock/S3 clients while the container
+# initialises, keeping that work off the first request
+image_pipeline.warm()
+
+
 def lambda_handler(event, context):
     """
     Dedicated handler for async image processing
     """
     try:
-        logger.info(f"ASYNC LAMBDA: Starting with event: {event}")
-
-        # Setup Django environment
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-
-        # Add current directory to path so Django can find our apps
-        sys.path.insert(0, '/var/task')
-
-        import django
-        django.setup()
-
-        # Import our async handler
-        from async_handler import process_images_async
+        logger.info("ASYNC LAMBDA: Starting with event: %s", event)
 
-        # Process the images
-        result = process_images_async(event, context)
+        # Generate the whole post when asked to, otherwise just the images
+        if event.get('action') == 'generate_post':
+            result = process_post_async(event, context)
+        else:
+            result = process_images_async(event, context)
 
-        logger.info(f"ASYNC LAMBDA: Completed with result: {result}")
+        logger.info("ASYNC LAMBDA: Completed with result: %s", result)
         return result
 
     except Exception as e:
-        logger.error(f"ASYNC LAMBDA: Error processing images: {str(e)}")
+        logger.error("ASYNC LAMBDA: Error processing images: %s", e)
         return {
             'statusCode': 500,
             'body': f'Error: {str(e)}'
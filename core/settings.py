@@ -103,6 +103,19 @@ else:
         }
     }
 
+# Cache
+# LocMemCache (Django's default) is per process, so on Lambda every container
+# keeps its own entries. USE_DB_CACHE=True stores them in the database instead,
+# sharing cached Bedrock responses across containers and deploys; create the
+# table once with `python manage.py createcachetable`.
+if os.getenv('USE_DB_CACHE', 'False').lower() == 'true':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -152,6 +165,21 @@ AWS_STORAGE_BUCKET_NAME = os.getenv('AWS_STORAGE_BUCKET_NAME', 'linkedin-generat
 AWS_S3_REGION_NAME = os.getenv('AWS_REGION', 'us-east-1')
 AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
 
+# Bedrock response cache (uses the default Django cache; 0 disables it)
+LLM_CACHE_TIMEOUT = int(os.getenv('LLM_CACHE_TIMEOUT', '86400'))
+# Only near-deterministic requests are cached. The post call samples at 0.7
+# and is never cached, so resubmitting a URL gets a fresh post; the fallback
+# image-prompt call runs at temperature 0 and is
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv('LLM_CACHE_MAX_TEMPERATURE', '0.2'))
+
+# Run the scrape and Claude call in the async Lambda instead of the request.
+# The async function must be deployed with the generate_post handler first.
+ASYNC_TEXT_GENERATION = os.getenv('ASYNC_TEXT_GENERATION', 'False').lower() == 'true'
+
+# Longest article text (in characters) sent to Claude; longer articles keep
+# their start and end. 0 sends the full text.
+ARTICLE_MAX_CHARS = int(os.getenv('ARTICLE_MAX_CHARS', '6000'))
+
 # Static files configuration for production
 USE_S3 = os.getenv('USE_S3', 'False').lower() == 'true'
 
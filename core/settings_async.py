@@ -0,0 +1,22 @@
+"""
+Django settings for the async worker Lambdas
+
+The workers only read and write GeneratedPost rows and use the cache, so this
+module keeps the shared configuration from core.settings but registers just
+the generator app. django.setup() then skips the admin, auth, sessions,
+messages and staticfiles app configs (and admin's module autodiscovery), and
+the workers never build the WSGI handler or load the URLconf.
+"""
+
+from .settings import *
+
+INSTALLED_APPS = [
+    'generator',
+]
+
+MIDDLEWARE = []
+
+# The workers never resolve URLs; point the URLconf at this module's empty
+# urlpatterns so nothing imports core.urls (and, through it, the admin)
+ROOT_URLCONF = __name__
+urlpatterns = []
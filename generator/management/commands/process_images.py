@@ -0,0 +1,20 @@
+import json
+from django.core.management.base import BaseCommand
+
+from generator.services import image_pipeline
+
+
+class Command(BaseCommand):
+    help = 'Run the async image pipeline for a post locally (same flow as the image Lambda)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('post_id', type=int, help='ID of the GeneratedPost to process')
+        parser.add_argument(
+            '--summary',
+            default='Test summary for image generation',
+            help='Summary text used to build the image prompts'
+        )
+
+    def handle(self, *args, **options):
+        result = image_pipeline.run(options['post_id'], options['summary'])
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-14 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0003_generatedpost_image_prompt_1_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='generatedpost',
+            index=models.Index(fields=['-created_at'], name='gp_created_idx'),
+        ),
+    ]
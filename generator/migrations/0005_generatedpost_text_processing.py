@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-14 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0004_generatedpost_gp_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedpost',
+            name='generation_error',
+            field=models.TextField(blank=True, help_text='Why async text generation failed', null=True),
+        ),
+        migrations.AddField(
+            model_name='generatedpost',
+            name='text_processing',
+            field=models.BooleanField(default=False, help_text='Whether the post text is still being generated'),
+        ),
+    ]
@@ -35,6 +35,8 @@ class GeneratedPost(models.Model):
         help_text="AI-generated prompt used for second image"
     )
     markdown_content = models.TextField(help_text="Complete markdown output")
+    text_processing = models.BooleanField(default=False, help_text="Whether the post text is still being generated")
+    generation_error = models.TextField(blank=True, null=True, help_text="Why async text generation failed")
     images_processing = models.BooleanField(default=False, help_text="Whether images are currently being generated")
     images_completed_at = models.DateTimeField(null=True, blank=True, help_text="When image generation completed")
     created_at = models.DateTimeField(auto_now_add=True)
@@ -43,6 +45,10 @@ class GeneratedPost(models.Model):
         ordering = ['-created_at']
         verbose_name = "Generated Post"
         verbose_name_plural = "Generated Posts"
+        indexes = [
+            # Serves the newest-first history listing without a sort
+            models.Index(fields=['-created_at'], name='gp_created_idx'),
+        ]
 
     def __str__(self):
         return f"Post from {self.source_url} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
@@ -1,35 +1,464 @@
-import boto3
-import json
-import base64
 import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+
+import orjson
 from django.conf import settings
 
+from .llm_cache import LLMCache
+
+# pybase64's SIMD decoder is several times faster on multi-megabyte images;
+# the stdlib module has the same interface
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+__all__ = ['AIGenerator', 'generate_linkedin_content', 'generate_content_images']
+
 logger = logging.getLogger(__name__)
 
+# For Lambda, use default credential chain (no explicit credentials)
+# Set region explicitly
+BEDROCK_REGION = 'us-east-1'
+
+_CLIENT_LOCK = threading.Lock()
+_BEDROCK_CLIENTS = {}
+
+# botocore settings per caller. Worker clients serve the async Lambdas, where
+# image generation can run well past the 60s default and adaptive mode
+# rate-limits client-side after throttling instead of retrying on a fixed
+# backoff. Interactive clients serve calls made while an API Gateway request
+# waits (29s limit), so a slow or throttled call fails inside that budget with
+# an error page instead of a 504 while retries keep running.
+_CLIENT_CONFIGS = {
+    'worker': {
+        'retries': {'max_attempts': 5, 'mode': 'adaptive'},
+        'read_timeout': 120,
+        'connect_timeout': 5,
+    },
+    'interactive': {
+        'retries': {'total_max_attempts': 1, 'mode': 'standard'},
+        'read_timeout': 20,
+        'connect_timeout': 2,
+    },
+}
+
+
+def _get_bedrock_client(interactive=False):
+    """
+    Return the process-wide bedrock-runtime client, creating it on first use
+
+    Loading the botocore service model and opening the HTTPS pool only happens
+    once per process (or Lambda container); boto3 clients are thread-safe.
+
+    Args:
+        interactive (bool): Return the client tuned for the request path
+            instead of the async worker client
+    """
+    kind = 'interactive' if interactive else 'worker'
+    if kind not in _BEDROCK_CLIENTS:
+        with _CLIENT_LOCK:
+            if kind not in _BEDROCK_CLIENTS:
+                # boto3 and botocore are imported here rather than at module
+                # level so loading this module (e.g. via the URLconf) doesn't
+                # pay for them; the Lambda entry points still build the client
+                # during init
+                import boto3
+                from botocore.config import Config
+
+                # TCP keep-alive stops idle pooled connections from being dropped
+                # between warm Lambda invocations, so the next call skips a fresh
+                # TCP + TLS handshake
+                session = boto3.Session(region_name=BEDROCK_REGION)
+                _BEDROCK_CLIENTS[kind] = session.client(
+                    'bedrock-runtime',
+                    config=Config(
+                        max_pool_connections=32,
+                        tcp_keepalive=True,
+                        **_CLIENT_CONFIGS[kind]
+                    )
+                )
+                logger.info("Bedrock %s client created with region: %s", kind, BEDROCK_REGION)
+    return _BEDROCK_CLIENTS[kind]
+
+
+@lru_cache(maxsize=1)
+def _default_generator():
+    """Shared AIGenerator used by the module-level convenience functions"""
+    return AIGenerator()
+
+
+# Worker threads for the per-image Bedrock calls, shared by every AIGenerator so
+# warm invocations reuse them. boto3 clients are safe to call from threads.
+_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='bedrock-image')
+
+# Parsed fallback image prompts, keyed on the exact request so image retries and
+# regenerations for the same summary skip the model call. Posts are not cached:
+# resubmitting a URL is how users ask for a fresh one.
+_PROMPT_CACHE = LLMCache('image_prompts')
+
+# Fixed instructions for both Claude calls, sent as the system prompt. Keeping
+# them in one place means the image-prompt rules can't drift between the post
+# task and the fallback image-prompt task. The two requests don't share a
+# prompt-cache prefix: only the post request sends the emit_post tool. Each
+# user message only names its task and carries the article.
+_SYSTEM_PROMPT = """You are generating LinkedIn assets from an article. The first line of each request names the task.
+
+Image prompt rules (used by both tasks) - each image prompt must be:
+- Relevant to the article's main theme and topic
+- Professional and business-appropriate
+- Free of text, logos, or specific people
+- Built from descriptive visual elements that represent the concept
+- Suitable for social media sharing
+Two prompts for the same article should be visually distinct but thematically related to the content.
+
+Task: POST
+Create a professional LinkedIn post with business insights. Respond by calling the emit_post tool with exactly these fields:
+{
+"linkedin_post": "A professional LinkedIn post (2-3 paragraphs, engaging, with relevant hashtags)",
+"summary": "A concise summary of the key points from the article (3-4 sentences)",
+"business_rationale": "Explanation of why this content is valuable for business professionals (2-3 sentences)",
+"image_prompt_1": "First image prompt to accompany the post",
+"image_prompt_2": "Second image prompt to accompany the post"
+}
+
+Make sure the LinkedIn post is:
+- Professional yet engaging
+- Includes relevant insights and takeaways
+- Contains 3-5 relevant hashtags
+- Is optimized for LinkedIn engagement
+- Between 150-300 words
+
+Follow any additional instructions given after the article.
+
+Task: IMAGE_PROMPTS
+Create 2 image prompts for LinkedIn posts about the article. Respond with exactly 2 prompts in this JSON format:
+{
+"prompt1": "First image prompt here",
+"prompt2": "Second image prompt here"
+}
+
+Return only valid JSON."""
+
+# Structured output for the POST task; field descriptions mirror the schema in
+# _SYSTEM_PROMPT
+_POST_TOOL = {
+    "name": "emit_post",
+    "description": "Return the generated LinkedIn post, summary, business rationale and image prompts",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "linkedin_post": {"type": "string"},
+            "summary": {"type": "string"},
+            "business_rationale": {"type": "string"},
+            "image_prompt_1": {"type": "string"},
+            "image_prompt_2": {"type": "string"}
+        },
+        "required": ["linkedin_post", "summary", "business_rationale", "image_prompt_1", "image_prompt_2"]
+    }
+}
+
+
+# Topic-based fallback image prompts
+_TOPIC_PROMPTS = {
+    'ai': [
+        "Futuristic digital brain with neural network connections, glowing nodes and data streams, professional tech illustration with blue and purple gradients",
+        "Abstract representation of artificial intelligence with geometric patterns, circuit boards, and flowing data visualizations in corporate colors"
+    ],
+    'technology': [
+        "Modern technology workspace with connected devices, holographic displays, and digital interfaces, clean minimalist design",
+        "Innovation concept with gears, digital networks, and technological growth symbols in professional blue tones"
+    ],
+    'business': [
+        "Professional business meeting with diverse team, modern office setting, collaboration and growth symbols",
+        "Corporate success visualization with charts, graphs, and upward trends in sophisticated color palette"
+    ],
+    'finance': [
+        "Financial growth concept with rising charts, currency symbols, and investment graphics in gold and blue",
+        "Professional banking and finance illustration with secure transactions and economic indicators"
+    ],
+    'marketing': [
+        "Digital marketing concept with social media icons, engagement metrics, and brand connectivity illustrations",
+        "Modern advertising and communication visualization with target audience and campaign elements"
+    ],
+    'leadership': [
+        "Leadership and team management concept with organizational charts and collaborative elements",
+        "Professional development and mentoring visualization with growth arrows and people connections"
+    ],
+    'innovation': [
+        "Innovation and creativity concept with lightbulb, gears, and breakthrough visualization elements",
+        "Cutting-edge research and development illustration with scientific and technological advancement themes"
+    ]
+}
+
+_TOPIC_PATTERN = re.compile(r'\b(' + '|'.join(map(re.escape, _TOPIC_PROMPTS)) + r')\b')
+
+
+@lru_cache(maxsize=256)
+def _detect_topic(text_content):
+    """
+    Return the dominant _TOPIC_PROMPTS keyword in a text, or None
+
+    Pure given the static keyword table, so results are memoized for the
+    retries and reruns that see the same summary again.
+
+    Args:
+        text_content (str): The article content to analyze
+
+    Returns:
+        str: Detected topic, or None if no keyword appears
+    """
+    # One scan for all topic keywords; word boundaries avoid false matches.
+    # The most frequently mentioned topic wins, ties going to the one that
+    # appears first, so the choice does not depend on table order.
+    counts = Counter()
+    first_seen = {}
+    for match in _TOPIC_PATTERN.finditer(text_content.lower()):
+        topic = match.group(1)
+        counts[topic] += 1
+        first_seen.setdefault(topic, match.start())
+
+    if not counts:
+        return None
+    return max(counts, key=lambda t: (counts[t], -first_seen[t]))
 
-class AIGenerator:
-    """Service for generating LinkedIn posts and images using AWS Bedrock"""
 
-    def __init__(self):
-        import os
+# Default professional prompts if no specific topic detected
+_DEFAULT_PROMPTS = [
+    "Professional business concept illustration with modern design elements, corporate colors, and innovation symbols",
+    "Abstract professional graphic showing growth, success, and forward-thinking business strategy with geometric elements"
+]
 
-        # For Lambda, use default credential chain (no explicit credentials)
-        # Set region explicitly
-        region = 'us-east-1'
+# First entry of the "images" array in a Titan response. Base64 never contains
+# quotes or backslashes, so anything else (escaped characters, an empty array)
+# falls through to a full parse.
+_FIRST_IMAGE_RE = re.compile(rb'"images"\s*:\s*\[\s*"([^"\\]+)"')
 
-        # Create session first, then client
-        session = boto3.Session(region_name=region)
-        self.bedrock_client = session.client('bedrock-runtime')
 
-        # Log for debugging
-        logger.info(f"Bedrock client created with region: {region}")
+# Image request bodies are constant apart from the prompt, so they are
+# serialized once here and the JSON-encoded prompt is spliced in per call
+_PROMPT_PLACEHOLDER = "__PROMPT__"
+_PROMPT_PLACEHOLDER_JSON = orjson.dumps(_PROMPT_PLACEHOLDER)
+_NEGATIVE_TEXT = "blurry, low quality, distorted, unprofessional, nsfw"
 
+
+def _image_body_template(generation_config, negative_text=None):
+    """
+    Serialize a TEXT_IMAGE request with a placeholder where the prompt goes
+
+    Args:
+        generation_config (dict): imageGenerationConfig for the request
+        negative_text (str): Optional negativeText for the request
+
+    Returns:
+        bytes: JSON request body containing the prompt placeholder
+    """
+    text_params = {"text": _PROMPT_PLACEHOLDER}
+    if negative_text:
+        text_params["negativeText"] = negative_text
+    return orjson.dumps({
+        "taskType": "TEXT_IMAGE",
+        "textToImageParams": text_params,
+        "imageGenerationConfig": generation_config
+    })
+
+
+def _render_image_body(template, prompt_text):
+    """
+    Fill a serialized image request template with a prompt
+
+    Args:
+        template (bytes): Body from _image_body_template
+        prompt_text (str): Prompt to insert (JSON-escaped here)
+
+    Returns:
+        bytes: Request body ready for invoke_model
+    """
+    return template.replace(_PROMPT_PLACEHOLDER_JSON, orjson.dumps(prompt_text), 1)
+
+
+# Nova Canvas request format (image 1 of generate_images)
+_NOVA_BODY = _image_body_template({
+    "numberOfImages": 1,
+    "quality": "standard",
+    "height": 1024,
+    "width": 1024,
+    "cfgScale": 8.0,
+    "seed": 42
+})
+
+# generate_single_image's 'nova' request uses the Titan format
+_SINGLE_NOVA_BODY = _image_body_template({
+    "numberOfImages": 1,
+    "height": 1024,
+    "width": 1024,
+    "cfgScale": 8.0,
+    "seed": 42
+}, _NEGATIVE_TEXT)
+
+# Titan G1 v2 request format
+_TITAN_BODY = _image_body_template({
+    "numberOfImages": 1,
+    "height": 1024,
+    "width": 1024,
+    "cfgScale": 7.5,
+    "seed": 43
+}, _NEGATIVE_TEXT)
+
+
+def _extract_first_image(raw_body):
+    """
+    Pull the first image out of a raw image-model response as decoded bytes
+
+    Avoids decoding the whole multi-megabyte response into a dict just to keep
+    one string from it, and decodes the base64 straight from the response
+    buffer so downstream code gets PNG bytes it can upload as-is.
+
+    Args:
+        raw_body (bytes): Response body as returned by invoke_model
+
+    Returns:
+        bytes: Decoded image data, or None if the response has no image
+    """
+    match = _FIRST_IMAGE_RE.search(raw_body)
+    if match:
+        return base64.b64decode(memoryview(raw_body)[match.start(1):match.end(1)])
+
+    try:
+        image_data = orjson.loads(raw_body)['images'][0]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return base64.b64decode(image_data)
+
+# Footer timestamp for the generated markdown
+_TIMESTAMP_FORMAT = "%Y-%m-%d at %H:%M UTC"
+
+# Marker left where the middle of an over-long article was cut
+_TRUNCATION_MARKER = "\n...\n"
+
+
+def _truncate_article(text, max_chars=None):
+    """
+    Trim article text to the prompt budget, keeping its start and its end
+
+    The thesis is usually stated up front and the conclusion at the end, so
+    when the text is over budget about two thirds of the budget is taken from
+    the start and a quarter from the end, cut on word boundaries.
+
+    Args:
+        text (str): Scraped article content
+        max_chars (int): Character budget; defaults to settings.ARTICLE_MAX_CHARS,
+            and 0 disables truncation
+
+    Returns:
+        str: The text, unchanged if it already fits the budget
+    """
+    if max_chars is None:
+        max_chars = getattr(settings, 'ARTICLE_MAX_CHARS', 6000)
+    if not max_chars or len(text) <= max_chars:
+        return text
+
+    head = text[:max_chars * 2 // 3].rsplit(' ', 1)[0]
+    # Sliced from an explicit start index: text[-0:] would be the whole text
+    tail = text[len(text) - max_chars // 4:].split(' ', 1)[-1]
+    return f"{head}{_TRUNCATION_MARKER}{tail}"
+
+
+def _parse_json_object(text):
+    """
+    Parse the JSON object in a model reply, ignoring any prose around it
+
+    Claude sometimes wraps the requested JSON in a sentence or a code fence,
+    so only the span from the first '{' to the last '}' is decoded.
+
+    Args:
+        text (str): Model reply
+
+    Returns:
+        dict: Parsed JSON object
+
+    Raises:
+        orjson.JSONDecodeError: If the reply contains no valid JSON object
+    """
+    start = text.find('{')
+    end = text.rfind('}') + 1
+    if 0 <= start < end:
+        text = text[start:end]
+    return orjson.loads(text)
+
+
+# Bedrock model errors worth retrying that botocore's retry modes do not cover;
+# throttling and 5xx responses are already retried by the client's adaptive mode
+_RETRYABLE_MODEL_ERRORS = frozenset({'ModelTimeoutException', 'ModelNotReadyException'})
+_MAX_MODEL_ATTEMPTS = 3
+
+
+def _call_with_retry(operation, max_attempts=_MAX_MODEL_ATTEMPTS, **kwargs):
+    """
+    Call a Bedrock runtime operation, retrying transient model errors
+
+    Waits use exponential backoff with full jitter so concurrent callers do
+    not retry in lockstep.
+
+    Args:
+        operation (callable): Bound client method, e.g. client.invoke_model
+        max_attempts (int): Attempts before a retryable error is raised
+        **kwargs: Arguments for the operation
+
+    Returns:
+        dict: The operation's response
+    """
+    # Already loaded by the client that owns the operation
+    from botocore.exceptions import ClientError
+
+    for attempt in range(1, max_attempts + 1):
         try:
-            # Test credentials - bedrock-runtime doesn't have list_foundation_models
-            # Just log that client was created successfully
-            logger.info("Bedrock runtime client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to create Bedrock client: {str(e)}")
+            return operation(**kwargs)
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if code not in _RETRYABLE_MODEL_ERRORS or attempt == max_attempts:
+                raise
+            delay = random.uniform(0, min(8, 0.25 * 2 ** attempt))
+            logger.warning("Bedrock returned %s, retrying in %.2fs", code, delay)
+            time.sleep(delay)
+
+
+def _log_usage(usage):
+    """
+    Log Claude token usage
+
+    Args:
+        usage (dict): 'usage' object from a Messages API response
+    """
+    logger.info(
+        "Claude usage: input=%s output=%s",
+        usage.get('input_tokens'),
+        usage.get('output_tokens')
+    )
+
+
+class AIGenerator:
+    """Service for generating LinkedIn posts and images using AWS Bedrock"""
+
+    def __init__(self, interactive=False):
+        """
+        Args:
+            interactive (bool): True when called while a web request waits on
+                the result; model calls then use the short-timeout client and
+                are not retried, so they finish inside API Gateway's limit
+        """
+        # The Bedrock client (and its connection pool) is shared by every
+        # instance, so constructing an AIGenerator per request is cheap
+        self.interactive = interactive
+        self.bedrock_client = _get_bedrock_client(interactive)
+        self.model_attempts = 1 if interactive else _MAX_MODEL_ATTEMPTS
 
         # Model configurations - using models that support on-demand throughput
         self.text_model_id = "anthropic.claude-3-5-sonnet-20240620-v1:0"  # This version supports on-demand
@@ -37,70 +466,118 @@ class AIGenerator:
         self.image_model_nova = "amazon.titan-image-generator-v2:0"  # Using Titan for both for now
         self.image_model_titan = "amazon.titan-image-generator-v2:0"  # Titan G1 v2 for image 2
 
-    def generate_text_content(self, scraped_content, user_prompt_adjustment=""):
+    def _invoke_text_model(self, request_body):
         """
-        Generate LinkedIn post, summary, and business rationale using Claude
+        Call Claude and return the generated text (or a forced tool call's input as JSON)
+
+        Uses the streaming API so the response is read while the model is
+        still generating; falls back to a plain invoke_model call if the
+        stream cannot be opened or breaks part-way.
 
         Args:
-            scraped_content (str): The scraped article content
-            user_prompt_adjustment (str): Additional user instructions
+            request_body (dict): Anthropic Messages API request body
 
         Returns:
-            dict: Generated content with 'success', 'data', and 'error' keys
+            str: Text of the model's reply
         """
+        body = orjson.dumps(request_body)
+
         try:
-            # Construct the prompt
-            base_prompt = f"""
-            Based on the following article content, create a professional LinkedIn post with business insights.
+            response = _call_with_retry(
+                self.bedrock_client.invoke_model_with_response_stream,
+                max_attempts=self.model_attempts,
+                modelId=self.text_model_id,
+                body=body
+            )
 
-            Article Content:
-            {scraped_content}
+            parts = []
+            usage = {}
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                message = orjson.loads(chunk['bytes'])
+                message_type = message.get('type')
+                if message_type == 'content_block_delta':
+                    delta = message['delta']
+                    # Plain replies stream text; forced tool calls stream their
+                    # input as JSON fragments
+                    parts.append(delta.get('text') or delta.get('partial_json') or '')
+                elif message_type == 'message_start':
+                    usage.update(message['message'].get('usage', {}))
+                elif message_type == 'message_delta':
+                    usage.update(message.get('usage', {}))
+            _log_usage(usage)
+            return ''.join(parts)
 
-            {f"Additional Instructions: {user_prompt_adjustment}" if user_prompt_adjustment else ""}
+        except Exception as e:
+            if self.interactive:
+                # A second, non-streaming call would not fit in the request budget
+                raise
+            logger.warning("Streaming Claude call failed, retrying without streaming: %s", e)
+
+        response = _call_with_retry(
+            self.bedrock_client.invoke_model,
+            max_attempts=self.model_attempts,
+            modelId=self.text_model_id,
+            body=body
+        )
+        response_body = orjson.loads(response['body'].read())
+        _log_usage(response_body.get('usage', {}))
+        block = response_body['content'][0]
+        if block.get('type') == 'tool_use':
+            return orjson.dumps(block['input']).decode()
+        return block['text']
 
-            Please respond with a JSON object containing exactly these fields:
-            {{
-                "linkedin_post": "A professional LinkedIn post (2-3 paragraphs, engaging, with relevant hashtags)",
-                "summary": "A concise summary of the key points from the article (3-4 sentences)",
-                "business_rationale": "Explanation of why this content is valuable for business professionals (2-3 sentences)"
-            }}
+    def generate_text_content(self, scraped_content, user_prompt_adjustment=""):
+        """
+        Generate LinkedIn post, summary, business rationale and image prompts using Claude
 
-            Make sure the LinkedIn post is:
-            - Professional yet engaging
-            - Includes relevant insights and takeaways
-            - Contains 3-5 relevant hashtags
-            - Is optimized for LinkedIn engagement
-            - Between 150-300 words
+        The image prompts come back from the same call, so the article is only
+        sent to the model once; they are optional in the result and
+        generate_images() falls back to _create_context_aware_prompts() when
+        they are missing.
 
-            Return only valid JSON.
-            """
+        Args:
+            scraped_content (str): The scraped article content
+            user_prompt_adjustment (str): Additional user instructions
 
-            # Prepare the request
+        Returns:
+            dict: Generated content with 'success', 'data', and 'error' keys
+        """
+        try:
+            # Static instructions live in the shared system prompt; only the
+            # task and article go in the user message
+            # Long articles are trimmed first: input tokens drive both the cost
+            # and the latency of the call
+            article_block = f"Task: POST\n\nArticle Content:\n{_truncate_article(scraped_content)}"
+            if user_prompt_adjustment:
+                article_block += f"\n\nAdditional Instructions: {user_prompt_adjustment}"
+
+            # Prepare the request. Forcing the emit_post tool makes Claude return
+            # structured input instead of free text, and the cap is sized to the
+            # ~700 tokens the five fields actually need, with headroom
             request_body = {
                 "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 4000,
+                "max_tokens": 1500,
+                "system": _SYSTEM_PROMPT,
+                "tools": [_POST_TOOL],
+                "tool_choice": {"type": "tool", "name": _POST_TOOL["name"]},
                 "messages": [
                     {
                         "role": "user",
-                        "content": base_prompt
+                        "content": article_block
                     }
                 ],
                 "temperature": 0.7
             }
 
             # Make the API call
-            response = self.bedrock_client.invoke_model(
-                modelId=self.text_model_id,
-                body=json.dumps(request_body)
-            )
-
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            generated_text = response_body['content'][0]['text']
+            generated_text = self._invoke_text_model(request_body)
 
             # Try to parse the JSON response
             try:
-                generated_content = json.loads(generated_text)
+                generated_content = _parse_json_object(generated_text)
 
                 # Validate required fields
                 required_fields = ['linkedin_post', 'summary', 'business_rationale']
@@ -113,7 +590,7 @@ class AIGenerator:
                     'error': None
                 }
 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 # Fallback: try to extract content even if not proper JSON
                 logger.warning("Generated content is not valid JSON, attempting fallback parsing")
                 return {
@@ -123,7 +600,7 @@ class AIGenerator:
                 }
 
         except Exception as e:
-            logger.error(f"Error generating text content: {str(e)}")
+            logger.error("Error generating text content: %s", e)
             return {
                 'success': False,
                 'data': None,
@@ -142,59 +619,44 @@ class AIGenerator:
         """
         try:
             # Use Claude to analyze content and generate appropriate image prompts
-            prompt_generation_request = f"""
-            Based on this article content: "{text_content}"
-
-            Create 2 distinct, professional image prompts for LinkedIn posts. Each prompt should:
-            1. Be relevant to the article's main theme and topic
-            2. Be professional and business-appropriate
-            3. Avoid text, logos, or specific people
-            4. Use descriptive visual elements that represent the concept
-            5. Be suitable for social media sharing
-
-            Respond with exactly 2 prompts in this JSON format:
-            {{
-                "prompt1": "First image prompt here",
-                "prompt2": "Second image prompt here"
-            }}
-
-            Make the prompts visually distinct but thematically related to the content.
-            """
+            article_block = f"Task: IMAGE_PROMPTS\n\nArticle Content:\n{_truncate_article(text_content)}"
 
             # Generate prompts using Claude
             request_body = {
                 "anthropic_version": "bedrock-2023-05-31",
                 "max_tokens": 1000,
+                "system": _SYSTEM_PROMPT,
                 "messages": [
                     {
                         "role": "user",
-                        "content": prompt_generation_request
+                        "content": article_block
                     }
                 ],
-                "temperature": 0.7
+                # Deterministic, so the same summary always maps to the same
+                # prompts and the cached pair is as good as a fresh one
+                "temperature": 0
             }
 
-            response = self.bedrock_client.invoke_model(
-                modelId=self.text_model_id,
-                body=json.dumps(request_body)
-            )
+            cached_prompts = _PROMPT_CACHE.get(self.text_model_id, request_body)
+            if cached_prompts is not None:
+                return cached_prompts
 
-            response_body = json.loads(response['body'].read())
-            generated_prompts_text = response_body['content'][0]['text']
+            generated_prompts_text = self._invoke_text_model(request_body)
 
             # Parse the JSON response
-            prompts_data = json.loads(generated_prompts_text)
+            prompts_data = _parse_json_object(generated_prompts_text)
 
             context_prompts = [
                 prompts_data['prompt1'],
                 prompts_data['prompt2']
             ]
 
-            logger.info(f"Generated context-aware prompts: {context_prompts}")
+            logger.info("Generated context-aware prompts: %s", context_prompts)
+            _PROMPT_CACHE.set(self.text_model_id, request_body, context_prompts)
             return context_prompts
 
         except Exception as e:
-            logger.warning(f"Failed to generate context-aware prompts: {str(e)}")
+            logger.warning("Failed to generate context-aware prompts: %s", e)
             # Fallback to intelligent generic prompts based on keywords
             return self._create_fallback_prompts(text_content)
 
@@ -208,64 +670,14 @@ class AIGenerator:
         Returns:
             list: Two fallback image prompts
         """
-        # Convert to lowercase for keyword matching
-        content_lower = text_content.lower()
-
-        # Define topic-based prompt templates
-        topic_prompts = {
-            'ai': [
-                "Futuristic digital brain with neural network connections, glowing nodes and data streams, professional tech illustration with blue and purple gradients",
-                "Abstract representation of artificial intelligence with geometric patterns, circuit boards, and flowing data visualizations in corporate colors"
-            ],
-            'technology': [
-                "Modern technology workspace with connected devices, holographic displays, and digital interfaces, clean minimalist design",
-                "Innovation concept with gears, digital networks, and technological growth symbols in professional blue tones"
-            ],
-            'business': [
-                "Professional business meeting with diverse team, modern office setting, collaboration and growth symbols",
-                "Corporate success visualization with charts, graphs, and upward trends in sophisticated color palette"
-            ],
-            'finance': [
-                "Financial growth concept with rising charts, currency symbols, and investment graphics in gold and blue",
-                "Professional banking and finance illustration with secure transactions and economic indicators"
-            ],
-            'marketing': [
-                "Digital marketing concept with social media icons, engagement metrics, and brand connectivity illustrations",
-                "Modern advertising and communication visualization with target audience and campaign elements"
-            ],
-            'leadership': [
-                "Leadership and team management concept with organizational charts and collaborative elements",
-                "Professional development and mentoring visualization with growth arrows and people connections"
-            ],
-            'innovation': [
-                "Innovation and creativity concept with lightbulb, gears, and breakthrough visualization elements",
-                "Cutting-edge research and development illustration with scientific and technological advancement themes"
-            ]
-        }
-
-        # Check for keywords and select appropriate prompts (more specific matching)
-        detected_topics = []
-        for topic, prompts in topic_prompts.items():
-            # Use word boundaries to avoid false matches
-            import re
-            pattern = r'\b' + topic + r'\b'
-            if re.search(pattern, content_lower):
-                detected_topics.append((topic, prompts))
-
-        # Return prompts for the first detected topic
-        if detected_topics:
-            topic, prompts = detected_topics[0]
-            logger.info(f"Detected topic '{topic}' - using targeted prompts")
-            return prompts
+        topic = _detect_topic(text_content)
+        if topic:
+            logger.info("Detected topic '%s' - using targeted prompts", topic)
+            return _TOPIC_PROMPTS[topic]
 
         # Default professional prompts if no specific topic detected
-        default_prompts = [
-            "Professional business concept illustration with modern design elements, corporate colors, and innovation symbols",
-            "Abstract professional graphic showing growth, success, and forward-thinking business strategy with geometric elements"
-        ]
-
         logger.info("Using default professional prompts")
-        return default_prompts
+        return _DEFAULT_PROMPTS
 
     def generate_single_image(self, prompt_text, model_type='nova'):
         """
@@ -276,46 +688,20 @@ class AIGenerator:
             model_type (str): 'nova' for Nova Canvas or 'titan' for Titan Image Generator
 
         Returns:
-            dict: Generated image with 'success', 'image', 'prompt', and 'error' keys
+            dict: Generated image with 'success', 'image' (PNG bytes), 'prompt', and 'error' keys
         """
         try:
-            logger.info(f"Starting single image generation with {model_type}")
-            logger.info(f"Prompt text: {prompt_text[:100]}...")
+            logger.info("Starting single image generation with %s", model_type)
+            logger.debug("Prompt text: %.100s...", prompt_text)
 
             if model_type == 'nova':
                 # Using Titan for Nova model type (same format as Titan)
-                request_body = {
-                    "taskType": "TEXT_IMAGE",
-                    "textToImageParams": {
-                        "text": prompt_text,
-                        "negativeText": "blurry, low quality, distorted, unprofessional, nsfw"
-                    },
-                    "imageGenerationConfig": {
-                        "numberOfImages": 1,
-                        "height": 1024,
-                        "width": 1024,
-                        "cfgScale": 8.0,
-                        "seed": 42
-                    }
-                }
+                template = _SINGLE_NOVA_BODY
                 model_id = self.image_model_nova
 
             elif model_type == 'titan':
                 # Titan G1 v2 request format
-                request_body = {
-                    "taskType": "TEXT_IMAGE",
-                    "textToImageParams": {
-                        "text": prompt_text,
-                        "negativeText": "blurry, low quality, distorted, unprofessional, nsfw"
-                    },
-                    "imageGenerationConfig": {
-                        "numberOfImages": 1,
-                        "height": 1024,
-                        "width": 1024,
-                        "cfgScale": 7.5,
-                        "seed": 43
-                    }
-                }
+                template = _TITAN_BODY
                 model_id = self.image_model_titan
             else:
                 error_msg = f"Unsupported model type: {model_type}"
@@ -327,22 +713,25 @@ class AIGenerator:
                     'error': error_msg
                 }
 
-            logger.info(f"Using model: {model_id}")
-            logger.info(f"Request body: {json.dumps(request_body, indent=2)}")
+            request_body = _render_image_body(template, prompt_text)
+
+            logger.info("Using model: %s", model_id)
+            logger.debug("Request body: %s", request_body)
 
-            response = self.bedrock_client.invoke_model(
+            response = _call_with_retry(
+                self.bedrock_client.invoke_model,
+                max_attempts=self.model_attempts,
                 modelId=model_id,
-                body=json.dumps(request_body)
+                body=request_body
             )
 
-            logger.info(f"Bedrock response status: {response.get('ResponseMetadata', {}).get('HTTPStatusCode', 'unknown')}")
+            logger.info("Bedrock response status: %s", response.get('ResponseMetadata', {}).get('HTTPStatusCode', 'unknown'))
 
-            response_body = json.loads(response['body'].read())
-            logger.info(f"Response body keys: {list(response_body.keys())}")
+            raw_body = response['body'].read()
+            image_data = _extract_first_image(raw_body)
 
-            if 'images' in response_body and len(response_body['images']) > 0:
-                image_data = response_body['images'][0]
-                logger.info(f"Successfully generated image with {model_type}")
+            if image_data is not None:
+                logger.info("Successfully generated image with %s", model_type)
                 return {
                     'success': True,
                     'image': image_data,
@@ -350,7 +739,7 @@ class AIGenerator:
                     'error': None
                 }
             else:
-                error_msg = f'No image generated with {model_type}. Response: {response_body}'
+                error_msg = f'No image generated with {model_type}. Response: {orjson.loads(raw_body)}'
                 logger.warning(error_msg)
                 return {
                     'success': False,
@@ -369,98 +758,89 @@ class AIGenerator:
                 'error': error_msg
             }
 
-    def generate_images(self, text_content, num_images=2):
+    def _invoke_image_model(self, model_id, request_body, label):
         """
-        Generate context-aware images using Nova Canvas and Titan Image Generator G1 v2
+        Invoke an image model and return the first image, or None on failure
 
         Args:
-            text_content (str): Text to base images on (summary or rationale)
-            num_images (int): Number of images to generate (default 2)
+            model_id (str): Bedrock model ID
+            request_body (bytes): Serialized model request payload
+            label (str): Human-readable description used in log messages
 
         Returns:
-            dict: Generated images with 'success', 'images', and 'error' keys
+            bytes: Decoded image data, or None if no image was generated
         """
         try:
-            generated_images = []
+            response = _call_with_retry(
+                self.bedrock_client.invoke_model,
+                max_attempts=self.model_attempts,
+                modelId=model_id,
+                body=request_body
+            )
 
-            # Generate dynamic, context-aware prompts based on the article content
-            prompts = self._create_context_aware_prompts(text_content)
+            image_data = _extract_first_image(response['body'].read())
 
-            # Generate Image 1 with Nova Canvas
-            if num_images >= 1:
-                try:
-                    # Nova Canvas request format
-                    nova_request = {
-                        "taskType": "TEXT_IMAGE",
-                        "textToImageParams": {
-                            "text": prompts[0]
-                        },
-                        "imageGenerationConfig": {
-                            "numberOfImages": 1,
-                            "quality": "standard",
-                            "height": 1024,
-                            "width": 1024,
-                            "cfgScale": 8.0,
-                            "seed": 42
-                        }
-                    }
-
-                    response = self.bedrock_client.invoke_model(
-                        modelId=self.image_model_nova,
-                        body=json.dumps(nova_request)
-                    )
+            if image_data is not None:
+                logger.info("Successfully generated %s", label)
+                return image_data
 
-                    response_body = json.loads(response['body'].read())
+            logger.warning("No image generated for %s", label)
+            return None
 
-                    if 'images' in response_body and len(response_body['images']) > 0:
-                        image_data = response_body['images'][0]
-                        generated_images.append(image_data)
-                        logger.info("Successfully generated image 1 with Nova Canvas")
-                    else:
-                        logger.warning("No image generated with Nova Canvas")
-                        generated_images.append(None)
+        except Exception as e:
+            logger.error("Error generating %s: %s", label, e)
+            return None
 
-                except Exception as e:
-                    logger.error(f"Error generating image with Nova Canvas: {str(e)}")
-                    generated_images.append(None)
+    def generate_images(self, text_content, num_images=2, prompts=None, on_image=None):
+        """
+        Generate context-aware images using Nova Canvas and Titan Image Generator G1 v2
 
-            # Generate Image 2 with Titan G1 v2
-            if num_images >= 2:
-                try:
-                    # Titan G1 v2 request format
-                    titan_request = {
-                        "taskType": "TEXT_IMAGE",
-                        "textToImageParams": {
-                            "text": prompts[1],
-                            "negativeText": "blurry, low quality, distorted, unprofessional, nsfw"
-                        },
-                        "imageGenerationConfig": {
-                            "numberOfImages": 1,
-                            "height": 1024,
-                            "width": 1024,
-                            "cfgScale": 7.5,
-                            "seed": 43
-                        }
-                    }
+        Args:
+            text_content (str): Text to base images on (summary or rationale)
+            num_images (int): Number of images to generate (default 2)
+            prompts (list): Image prompts already produced by generate_text_content (optional)
+            on_image (callable): Optional on_image(index, image_bytes), run in the
+                generation worker as soon as that image is ready; its return value
+                (None for failure) is stored in 'images' in place of the bytes
 
-                    response = self.bedrock_client.invoke_model(
-                        modelId=self.image_model_titan,
-                        body=json.dumps(titan_request)
-                    )
+        Returns:
+            dict: Generated images (PNG bytes, None for failures) with 'success', 'images', and 'error' keys
+        """
+        try:
+            # Reuse the prompts from the text call when we have enough of them;
+            # otherwise ask Claude for context-aware prompts separately
+            if not prompts or len([p for p in prompts if p]) < num_images:
+                prompts = self._create_context_aware_prompts(text_content)
 
-                    response_body = json.loads(response['body'].read())
+            jobs = []
 
-                    if 'images' in response_body and len(response_body['images']) > 0:
-                        image_data = response_body['images'][0]
-                        generated_images.append(image_data)
-                        logger.info("Successfully generated image 2 with Titan Image Generator G1 v2")
-                    else:
-                        logger.warning("No image generated with Titan G1 v2")
-                        generated_images.append(None)
+            # Image 1 with Nova Canvas
+            if num_images >= 1:
+                jobs.append((
+                    self.image_model_nova,
+                    _render_image_body(_NOVA_BODY, prompts[0]),
+                    "image 1 with Nova Canvas"
+                ))
 
-                except Exception as e:
-                    logger.error(f"Error generating image with Titan G1 v2: {str(e)}")
-                    generated_images.append(None)
+            # Image 2 with Titan G1 v2
+            if num_images >= 2:
+                jobs.append((
+                    self.image_model_titan,
+                    _render_image_body(_TITAN_BODY, prompts[1]),
+                    "image 2 with Titan Image Generator G1 v2"
+                ))
+
+            def run_job(index, job):
+                image_data = self._invoke_image_model(*job)
+                if on_image is not None and image_data is not None:
+                    # Follow-up work (e.g. the S3 upload) starts here, overlapping
+                    # the other image's generation instead of waiting for it
+                    return on_image(index, image_data)
+                return image_data
+
+            # The image calls are independent, so run them concurrently; map()
+            # keeps results in job order so index i still means image i+1
+            generated_images = list(_IMAGE_EXECUTOR.map(run_job, range(len(jobs)), jobs))
 
             # Filter out None values and check if we have any successful images
             valid_images = [img for img in generated_images if img is not None]
@@ -481,7 +861,7 @@ class AIGenerator:
                 }
 
         except Exception as e:
-            logger.error(f"Error in image generation: {str(e)}")
+            logger.error("Error in image generation: %s", e)
             return {
                 'success': False,
                 'images': [],
@@ -499,7 +879,7 @@ class AIGenerator:
         Returns:
             str: Formatted markdown content
         """
-        markdown_content = f"""# LinkedIn Post Content
+        parts = [f"""# LinkedIn Post Content
 
 ## LinkedIn Post
 {post_data.get('linkedin_post', '')}
@@ -509,22 +889,23 @@ class AIGenerator:
 
 ## Business Rationale
 {post_data.get('business_rationale', '')}
-"""
+"""]
 
         if image_urls:
-            markdown_content += "\n## Generated Images\n"
-            for i, url in enumerate(image_urls, 1):
-                if url:
-                    markdown_content += f"![Generated Image {i}]({url})\n\n"
+            parts.append("\n## Generated Images\n")
+            parts.extend(
+                f"![Generated Image {i}]({url})\n\n"
+                for i, url in enumerate(image_urls, 1)
+                if url
+            )
 
-        markdown_content += f"\n---\n*Generated on {self._get_current_timestamp()}*"
+        parts.append(f"\n---\n*Generated on {self._get_current_timestamp()}*")
 
-        return markdown_content
+        return "".join(parts)
 
     def _get_current_timestamp(self):
-        """Get current timestamp in readable format"""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d at %H:%M UTC")
+        """Get current UTC timestamp in readable format"""
+        return datetime.now(timezone.utc).strftime(_TIMESTAMP_FORMAT)
 
 
 def generate_linkedin_content(scraped_content, user_prompt_adjustment=""):
@@ -538,20 +919,19 @@ def generate_linkedin_content(scraped_content, user_prompt_adjustment=""):
     Returns:
         dict: Generated content results
     """
-    generator = AIGenerator()
-    return generator.generate_text_content(scraped_content, user_prompt_adjustment)
+    return _default_generator().generate_text_content(scraped_content, user_prompt_adjustment)
 
 
-def generate_content_images(text_content, num_images=2):
+def generate_content_images(text_content, num_images=2, prompts=None):
     """
     Convenience function to generate images
 
     Args:
         text_content (str): Text content to base images on
         num_images (int): Number of images to generate
+        prompts (list): Image prompts from generate_linkedin_content (optional)
 
     Returns:
         dict: Generated images results
     """
-    generator = AIGenerator()
-    return generator.generate_images(text_content, num_images)
\ No newline at end of file
+    return _default_generator().generate_images(text_content, num_images, prompts)
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Shared async image-processing pipeline
+
+Both Lambda entry points (async_handler and async_image_processor) only parse
+their event and delegate here, so the generate -> upload -> persist flow lives
+in one place.
+"""
+
+import logging
+from django.db import DatabaseError
+from django.utils import timezone
+
+from ..models import GeneratedPost
+from .ai_generator import AIGenerator
+from .storage import S3StorageService
+
+logger = logging.getLogger(__name__)
+
+# Service clients are cached at module scope so warm invocations reuse the
+# boto3 sessions and connection pools created on the first call
+_AI_GENERATOR = None
+_S3 = None
+
+
+def _get_clients():
+    """
+    Return the cached (AIGenerator, S3StorageService) pair, creating it once per container
+    """
+    global _AI_GENERATOR, _S3
+    if _AI_GENERATOR is None:
+        _AI_GENERATOR = AIGenerator()
+    if _S3 is None:
+        _S3 = S3StorageService()
+    return _AI_GENERATOR, _S3
+
+
+def warm():
+    """
+    Build the cached service clients ahead of the first invocation
+
+    Called at import time by the Lambda entry points so boto3 client setup
+    runs during the init phase instead of on the first request. Failures are
+    only logged; the clients are then created lazily by the first run().
+    """
+    try:
+        _get_clients()
+    except Exception as e:
+        logger.warning("Could not pre-initialise image pipeline clients: %s", e)
+
+
+def _upload_image(storage_service, index, image_data, post_id):
+    """
+    Upload one generated image and return its URL, or None on failure
+
+    Runs inside the image-generation worker thread, so failures are logged
+    here rather than raised, letting the other image finish independently.
+    """
+    try:
+        upload_result = storage_service.upload_image(
+            image_data,
+            f"linkedin_post_{post_id}"
+        )
+        if upload_result['success']:
+            logger.info("Image %s uploaded: %s", index + 1, upload_result['url'])
+            return upload_result['url']
+        logger.error("Failed to upload image %s: %s", index + 1, upload_result['error'])
+    except Exception as e:
+        logger.error("Error uploading image %s: %s", index + 1, e)
+    return None
+
+
+def run(post_id, summary_text):
+    """
+    Generate, upload and persist the images for a post
+
+    Args:
+        post_id (int): ID of the GeneratedPost to process
+        summary_text (str): Summary used to build the image prompts
+
+    Returns:
+        dict: Result with 'processed' and 'images_generated' keys; 'processed'
+        is False when the post's images had already been handled, including by
+        a concurrent invocation that finished first
+
+    Raises:
+        ValueError: If the post does not exist
+    """
+    # Read the processing flag, the stored image prompts and the text used for
+    # the markdown in one projected query; the large original_content /
+    # markdown_content fields stay in the DB
+    try:
+        row = GeneratedPost.objects.values(
+            'images_processing', 'image_prompt_1', 'image_prompt_2',
+            'linkedin_post', 'summary', 'business_rationale'
+        ).get(pk=post_id)
+    except GeneratedPost.DoesNotExist:
+        raise ValueError(f"Post with id {post_id} not found")
+
+    # Check if already processed
+    if not row.pop('images_processing'):
+        logger.info("Post %s images already processed", post_id)
+        return {'processed': False, 'images_generated': 0}
+
+    # Generate images
+    logger.info("Generating images for post %s", post_id)
+    ai_generator, storage_service = _get_clients()
+    # Prompts saved with the post came from the text generation call; the
+    # generator only asks Claude again if they are missing
+    stored_prompts = [row.pop('image_prompt_1'), row.pop('image_prompt_2')]
+    # Each image is uploaded from its generation worker as soon as it is
+    # ready, so the first upload overlaps the second generation and the
+    # payload is released once its upload finishes; 'images' comes back as
+    # the uploaded URLs
+    image_result = ai_generator.generate_images(
+        summary_text,
+        prompts=stored_prompts,
+        on_image=lambda i, image_data: _upload_image(storage_service, i, image_data, post_id)
+    )
+
+    image_urls = [None, None]
+
+    if image_result['success'] and image_result['images']:
+        for i, url in enumerate(image_result['images'][:2]):
+            image_urls[i] = url
+    else:
+        logger.warning("Image generation failed: %s", image_result.get('error', 'Unknown error'))
+
+    # Update post in database
+    updates = {
+        'images_processing': False,
+        'images_completed_at': timezone.now(),
+    }
+
+    # Only overwrite the stored prompts when the generator returned some; a
+    # failed run leaves the ones saved by the text call for the next retry
+    image_prompts = image_result.get('prompts')
+    if image_prompts:
+        logger.info("Generated prompts: %s", image_prompts[:2])
+        updates['image_prompt_1'] = image_prompts[0]
+        updates['image_prompt_2'] = image_prompts[1] if len(image_prompts) > 1 else None
+
+    # Only touch the image columns and re-render the markdown when at least one
+    # upload succeeded; otherwise just close out the processing state
+    uploaded_urls = [url for url in image_urls if url]
+    if uploaded_urls:
+        updates['image_url_1'] = image_urls[0]
+        updates['image_url_2'] = image_urls[1]
+        updates['markdown_content'] = ai_generator.create_markdown_content(row, uploaded_urls)
+
+    # Write only the columns that changed instead of re-saving the whole row.
+    # The images_processing filter makes this a compare-and-set: if a duplicate
+    # invocation already completed the post, its results are left untouched.
+    if not GeneratedPost.objects.filter(pk=post_id, images_processing=True).update(**updates):
+        logger.info("Post %s images were completed by another invocation", post_id)
+        return {'processed': False, 'images_generated': 0}
+
+    logger.info("Successfully processed images for post %s", post_id)
+    return {
+        'processed': True,
+        'images_generated': len(uploaded_urls)
+    }
+
+
+def mark_failed(post_id):
+    """
+    Clear the processing flag so the UI stops waiting on a failed run
+
+    Args:
+        post_id (int): ID of the GeneratedPost whose processing failed
+    """
+    try:
+        # Flip the one column directly; no need to load and rewrite the row
+        GeneratedPost.objects.filter(pk=post_id).update(images_processing=False)
+    except DatabaseError as e:
+        logger.warning("Could not clear images_processing for post %s: %s", post_id, e)
@@ -0,0 +1,92 @@
+import hashlib
+import logging
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value):
+    """
+    Canonicalise a request payload for keying: whitespace runs in strings are
+    collapsed so re-scrapes that differ only in spacing share an entry. Case is
+    kept, since "US" and "us" (or an ALL CAPS instruction) change the reply.
+    """
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class LLMCache:
+    """Exact-match cache for parsed Bedrock model responses, backed by Django's cache framework"""
+
+    def __init__(self, namespace, timeout=None):
+        """
+        Args:
+            namespace (str): Prefix separating this cache's keys from other callers
+            timeout (int): Entry lifetime in seconds (defaults to settings.LLM_CACHE_TIMEOUT)
+        """
+        self.namespace = namespace
+        self.timeout = timeout if timeout is not None else getattr(settings, 'LLM_CACHE_TIMEOUT', 86400)
+        self.max_temperature = getattr(settings, 'LLM_CACHE_MAX_TEMPERATURE', 0.2)
+
+    def is_cacheable(self, request_body):
+        """
+        Whether responses to this request may be served from the cache
+
+        Sampling above LLM_CACHE_MAX_TEMPERATURE is treated as intentionally
+        non-deterministic and always goes to the model.
+        """
+        return bool(self.timeout) and request_body.get('temperature', 0) <= self.max_temperature
+
+    def make_key(self, model_id, request_body):
+        """
+        Build a stable cache key for a model request
+
+        Requests that differ only in whitespace map to the same key.
+
+        Args:
+            model_id (str): Bedrock model ID
+            request_body (dict): The exact request payload sent to the model
+
+        Returns:
+            str: Namespaced SHA-256 hex digest of the model ID and payload
+        """
+        raw = orjson.dumps({'model': model_id, 'request': _normalize(request_body)}, option=orjson.OPT_SORT_KEYS)
+        return f"llm:{self.namespace}:{hashlib.sha256(raw).hexdigest()}"
+
+    def get(self, model_id, request_body):
+        """
+        Return the cached result for a request, or None on a miss
+
+        Args:
+            model_id (str): Bedrock model ID
+            request_body (dict): The exact request payload sent to the model
+
+        Returns:
+            Cached value, or None
+        """
+        if not self.is_cacheable(request_body):
+            return None
+        value = cache.get(self.make_key(model_id, request_body))
+        if value is not None:
+            logger.info("LLM cache hit for %s", self.namespace)
+        return value
+
+    def set(self, model_id, request_body, value):
+        """
+        Store a successful result for a request
+
+        Args:
+            model_id (str): Bedrock model ID
+            request_body (dict): The exact request payload sent to the model
+            value: Parsed result to cache
+        """
+        if self.is_cacheable(request_body):
+            cache.set(self.make_key(model_id, request_body), value, self.timeout)
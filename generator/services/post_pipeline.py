@@ -0,0 +1,114 @@
+"""
+Async post-generation pipeline
+
+With ASYNC_TEXT_GENERATION enabled, generate_view only stores the URL and the
+user's instructions; the scrape and the Claude call run here, inside the async
+Lambda, which then hands the post to the image pipeline in the same invocation.
+"""
+
+import logging
+from django.db import DatabaseError
+
+from ..models import GeneratedPost
+from . import image_pipeline
+from .ai_generator import AIGenerator
+from .scraper import scrape_content
+
+logger = logging.getLogger(__name__)
+
+
+def run(post_id):
+    """
+    Scrape the article, generate the post text, then generate its images
+
+    Args:
+        post_id (int): ID of the pending GeneratedPost
+
+    Returns:
+        dict: Result with 'processed' and 'images_generated' keys; 'processed'
+        is False when the text had already been handled
+
+    Raises:
+        ValueError: If the post does not exist
+    """
+    try:
+        row = GeneratedPost.objects.values(
+            'text_processing', 'source_url', 'user_prompt_adjustment'
+        ).get(pk=post_id)
+    except GeneratedPost.DoesNotExist:
+        raise ValueError(f"Post with id {post_id} not found")
+
+    if not row['text_processing']:
+        logger.info("Post %s text already generated", post_id)
+        return {'processed': False, 'images_generated': 0}
+
+    # Step 1: Scrape content
+    scrape_result = scrape_content(row['source_url'])
+    if not scrape_result['success']:
+        mark_failed(post_id, f"Failed to scrape content: {scrape_result['error']}")
+        return {'processed': True, 'images_generated': 0}
+
+    scraped_content = scrape_result['content']
+
+    # Step 2: Generate AI content
+    ai_generator = AIGenerator()
+    ai_result = ai_generator.generate_text_content(scraped_content, row['user_prompt_adjustment'] or "")
+    if not ai_result['success']:
+        mark_failed(post_id, f"Failed to generate content: {ai_result['error']}")
+        return {'processed': True, 'images_generated': 0}
+
+    generated_data = ai_result['data']
+
+    # Step 3: Store the text. The text_processing filter makes this a
+    # compare-and-set, so a duplicate invocation can't overwrite a finished post
+    updated = GeneratedPost.objects.filter(pk=post_id, text_processing=True).update(
+        original_content=scraped_content,
+        linkedin_post=generated_data['linkedin_post'],
+        summary=generated_data['summary'],
+        business_rationale=generated_data['business_rationale'],
+        image_prompt_1=generated_data.get('image_prompt_1'),
+        image_prompt_2=generated_data.get('image_prompt_2'),
+        markdown_content=ai_generator.create_markdown_content(generated_data, []),
+        text_processing=False,
+        images_processing=True
+    )
+    if not updated:
+        logger.info("Post %s text was completed by another invocation", post_id)
+        return {'processed': False, 'images_generated': 0}
+
+    # Step 4: Images, in this same invocation. The text is already saved, so
+    # an image failure only ends the image stage and leaves the post readable
+    try:
+        image_result = image_pipeline.run(post_id, generated_data['summary'])
+    except Exception as e:
+        logger.error("Error processing images for post %s: %s", post_id, e)
+        image_pipeline.mark_failed(post_id)
+        return {'processed': True, 'images_generated': 0}
+    return {'processed': True, 'images_generated': image_result['images_generated']}
+
+
+def mark_failed(post_id, error="Post generation failed"):
+    """
+    Record a failed generation so the result page stops waiting on it
+
+    generation_error is only written while the text is still pending; once the
+    text has been stored, the failure belongs to the image stage and only the
+    images_processing flag is cleared, so the saved post stays visible.
+
+    Args:
+        post_id (int): ID of the GeneratedPost whose generation failed
+        error (str): Message shown on the result page
+    """
+    logger.error("Post %s generation failed: %s", post_id, error)
+    try:
+        updated = GeneratedPost.objects.filter(pk=post_id, text_processing=True).update(
+            text_processing=False,
+            images_processing=False,
+            generation_error=error
+        )
+    except DatabaseError as e:
+        logger.warning("Could not record the failure for post %s: %s", post_id, e)
+        return
+
+    if not updated:
+        image_pipeline.mark_failed(post_id)
@@ -1,10 +1,51 @@
+import re
 import requests
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from functools import lru_cache
+from bs4 import BeautifulSoup, FeatureNotFound
 from urllib.parse import urlparse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# lxml's C parser is several times faster than the pure-Python html.parser;
+# fall back to the latter where lxml is not installed
+try:
+    BeautifulSoup('', 'lxml')
+    _HTML_PARSER = 'lxml'
+except FeatureNotFound:
+    _HTML_PARSER = 'html.parser'
+
+# Only HTML responses are parsed, and at most this many (decompressed) bytes
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+_MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Runs of whitespace collapsed by _clean_text
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Unwanted elements removed from the whole page before extraction
+_DECOMPOSE_TAGS = ('script', 'style', 'nav', 'header', 'footer',
+                   'aside', 'advertisement', 'ad', 'sidebar')
+
+# Common non-content elements removed from <body> in the fallback path
+_BODY_DECOMPOSE_TAGS = ('header', 'nav', 'footer', 'aside', 'menu', 'sidebar')
+
+# Common main-content selectors, tried in order
+_CONTENT_SELECTORS = (
+    'article',
+    '[role="main"]',
+    'main',
+    '.content',
+    '.post-content',
+    '.entry-content',
+    '.article-content',
+    '.story-body',
+    '.post-body'
+)
+_CONTENT_PATTERNS = tuple(sv.compile(selector) for selector in _CONTENT_SELECTORS)
+# Union of all the above, so the document is walked once
+_ANY_CONTENT_PATTERN = sv.compile(', '.join(_CONTENT_SELECTORS))
+
 
 class ContentScraper:
     """Service for scraping content from web URLs"""
@@ -35,12 +76,31 @@ class ContentScraper:
                     'error': 'Invalid URL format'
                 }
 
-            # Fetch the webpage
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            # Fetch the webpage, streaming so non-HTML and oversize responses
+            # are rejected before their body is downloaded
+            with self.session.get(url, timeout=(5, 25), stream=True) as response:
+                response.raise_for_status()
+
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and not content_type.startswith(_HTML_CONTENT_TYPES):
+                    return {
+                        'success': False,
+                        'content': '',
+                        'error': f'URL does not point to an HTML page ({content_type})'
+                    }
+
+                # Pages past the cap are truncated; the readable article text
+                # is almost always well inside the first couple of megabytes
+                page = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    page += chunk
+                    if len(page) >= _MAX_PAGE_BYTES:
+                        logger.warning("Truncating %s at %s bytes", url, _MAX_PAGE_BYTES)
+                        del page[_MAX_PAGE_BYTES:]
+                        break
 
             # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(bytes(page), _HTML_PARSER)
 
             # Extract main content
             content = self._extract_main_content(soup)
@@ -59,14 +119,14 @@ class ContentScraper:
             }
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Request error for URL {url}: {str(e)}")
+            logger.error("Request error for URL %s: %s", url, e)
             return {
                 'success': False,
                 'content': '',
                 'error': f'Failed to fetch URL: {str(e)}'
             }
         except Exception as e:
-            logger.error(f"Unexpected error scraping URL {url}: {str(e)}")
+            logger.error("Unexpected error scraping URL %s: %s", url, e)
             return {
                 'success': False,
                 'content': '',
@@ -84,27 +144,17 @@ class ContentScraper:
             str: Extracted text content
         """
         # Remove unwanted elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer',
-                           'aside', 'advertisement', 'ad', 'sidebar']):
+        for element in soup(_DECOMPOSE_TAGS):
             element.decompose()
 
-        # Try to find main content using common selectors
-        content_selectors = [
-            'article',
-            '[role="main"]',
-            'main',
-            '.content',
-            '.post-content',
-            '.entry-content',
-            '.article-content',
-            '.story-body',
-            '.post-body'
-        ]
-
+        # Try to find main content using common selectors: collect every
+        # candidate in one pass, then keep the matches of the highest-priority
+        # selector that matched anything
         content_text = ""
+        candidates = _ANY_CONTENT_PATTERN.select(soup)
 
-        for selector in content_selectors:
-            elements = soup.select(selector)
+        for pattern in _CONTENT_PATTERNS:
+            elements = [elem for elem in candidates if pattern.match(elem)]
             if elements:
                 content_text = ' '.join([elem.get_text(strip=True) for elem in elements])
                 break
@@ -114,8 +164,7 @@ class ContentScraper:
             body = soup.find('body')
             if body:
                 # Remove common non-content elements
-                for element in body(['header', 'nav', 'footer', 'aside',
-                                   'menu', 'sidebar']):
+                for element in body(_BODY_DECOMPOSE_TAGS):
                     element.decompose()
                 content_text = body.get_text(separator=' ', strip=True)
 
@@ -135,8 +184,7 @@ class ContentScraper:
             str: Cleaned text
         """
         # Replace multiple spaces and newlines with single spaces
-        import re
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
 
         # Remove extra whitespace
         text = text.strip()
@@ -144,6 +192,17 @@ class ContentScraper:
         return text
 
 
+@lru_cache(maxsize=1)
+def _default_scraper():
+    """
+    Shared ContentScraper used by scrape_content
+
+    Reusing one requests.Session keeps HTTP connections (and their TLS
+    sessions) pooled across calls and warm Lambda invocations.
+    """
+    return ContentScraper()
+
+
 def scrape_content(url):
     """
     Convenience function to scrape content from a URL
@@ -154,5 +213,4 @@ def scrape_content(url):
     Returns:
         dict: Dictionary containing scraping results
     """
-    scraper = ContentScraper()
-    return scraper.scrape_url(url)
\ No newline at end of file
+    return _default_scraper().scrape_url(url)
\ No newline at end of file
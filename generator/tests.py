@@ -1,3 +1,28 @@
-from django.test import TestCase
+import os
+import subprocess
+import sys
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class ViewsImportTest(SimpleTestCase):
+    """The views must import without loading the AWS SDK"""
+
+    def test_views_import_does_not_load_botocore(self):
+        # A fresh interpreter, so modules loaded by the test runner or other
+        # tests don't mask an eager import
+        script = (
+            "import sys, django; django.setup(); import generator.views; "
+            "print(sorted(m for m in ('boto3', 'botocore') if m in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='core.settings')
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
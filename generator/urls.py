@@ -9,6 +9,7 @@ urlpatterns = [
     path('result/<int:post_id>/', views.result_view, name='result'),
     path('history/', views.history_view, name='history'),
     path('download/markdown/<int:post_id>/', views.download_markdown_view, name='download_markdown'),
+    path('api/history/', views.history_page_api, name='history_api'),
     path('api/image-status/<int:post_id>/', views.check_image_status, name='check_image_status'),
     path('api/regenerate-image/<int:post_id>/', views.regenerate_single_image, name='regenerate_single_image'),
 ]
\ No newline at end of file
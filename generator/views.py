@@ -1,11 +1,19 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib import messages
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, set_response_etag
 from django.views.decorators.csrf import csrf_protect, csrf_exempt
 from django.views.decorators.http import require_http_methods
 import logging
 import json
-import boto3
+import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlparse
 
 from .models import GeneratedPost
 from .services.scraper import scrape_content
@@ -14,38 +22,210 @@ from .services.storage import S3StorageService
 
 logger = logging.getLogger(__name__)
 
+# Characters per chunk of a streamed markdown download
+_DOWNLOAD_CHUNK_CHARS = 64 * 1024
+
+# Posts per page in the history table
+_HISTORY_PAGE_SIZE = 25
+
+# How long clients may reuse a finished post's status response. Kept short and
+# private rather than immutable because regenerating an image changes its URL
+_FINISHED_STATUS_MAX_AGE = 300
+
+# Dedicated async image Lambda for this environment. LINKEDIN_ASYNC_LAMBDA_ARN
+# can hold the function's full ARN so Lambda does not resolve the name on every
+# invoke; it also lets a deployment pick its function without relying on DEBUG
+_ASYNC_FUNCTION_NAME = os.getenv('LINKEDIN_ASYNC_LAMBDA_ARN') or (
+    'linkedin-generator-async-dev'
+    if os.getenv('DEBUG', 'True').lower() == 'true'
+    else 'linkedin-generator-async-production'
+)
+
+# Background threads for the async image trigger when not running in Lambda
+_TRIGGER_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='image-trigger')
+
+
+class _OrjsonResponse(HttpResponse):
+    """
+    JsonResponse equivalent for plain dicts, encoded with orjson
+
+    orjson serializes several times faster than the stdlib encoder behind
+    JsonResponse and returns bytes, which HttpResponse uses without re-encoding.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data), **kwargs)
+
+
+@lru_cache(maxsize=1)
+def _get_lambda_client():
+    """
+    Return the process-wide Lambda client used to start async image processing
+    """
+    # Only this client needs boto3 directly, so boto3 and botocore are
+    # imported on first use rather than when the URLconf loads the views
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        'lambda',
+        region_name='us-east-1',
+        config=Config(
+            retries={'max_attempts': 2, 'mode': 'standard'},
+            # Covers the trigger workers plus request threads outside Lambda
+            max_pool_connections=16,
+            # An Event invoke is acknowledged as soon as it is queued, so a
+            # slow endpoint fails fast instead of eating the request budget
+            connect_timeout=2,
+            read_timeout=5,
+            tcp_keepalive=True
+        )
+    )
+
 
 def trigger_async_image_generation(post_id, summary_text):
     """
     Trigger async image generation using Lambda invoke
     """
     try:
-        lambda_client = boto3.client('lambda', region_name='us-east-1')
+        lambda_client = _get_lambda_client()
 
         payload = {
             'post_id': post_id,
             'summary_text': summary_text
         }
 
-        # Determine async Lambda function name based on environment
-        import os
-        debug_mode = os.getenv('DEBUG', 'True').lower() == 'true'
-        async_function_name = 'linkedin-generator-async-dev' if debug_mode else 'linkedin-generator-async-production'
-
-        # Invoke async image processing (dedicated async Lambda)
+        # Invoke async image processing (dedicated async Lambda); orjson
+        # returns bytes, which botocore sends as-is
         response = lambda_client.invoke(
-            FunctionName=async_function_name,
+            FunctionName=_ASYNC_FUNCTION_NAME,
             InvocationType='Event',  # Async invocation
-            Payload=json.dumps(payload)  # No need for 'action' field anymore
+            Payload=orjson.dumps(payload)  # No need for 'action' field anymore
         )
 
-        logger.info(f"Triggered async image generation for post {post_id}, response: {response.get('StatusCode')}")
+        logger.info("Triggered async image generation for post %s, response: %s", post_id, response.get('StatusCode'))
 
     except Exception as e:
-        logger.error(f"Failed to trigger async image generation: {str(e)}")
+        logger.error("Failed to trigger async image generation: %s", e)
         raise
 
 
+def trigger_async_post_generation(post_id):
+    """
+    Trigger async scraping, text and image generation for a pending post
+    """
+    try:
+        response = _get_lambda_client().invoke(
+            FunctionName=_ASYNC_FUNCTION_NAME,
+            InvocationType='Event',
+            Payload=orjson.dumps({'action': 'generate_post', 'post_id': post_id})
+        )
+
+        logger.info("Triggered async post generation for post %s, response: %s", post_id, response.get('StatusCode'))
+
+    except Exception as e:
+        logger.error("Failed to trigger async post generation: %s", e)
+        raise
+
+
+def _create_pending_post(source_url, user_prompt_adjustment):
+    """
+    Store a pending post and hand all of its generation to the async Lambda
+
+    The request then only pays for one INSERT and an Event invoke; the result
+    page polls until the text, and then the images, are ready.
+    """
+    # The invoke is deferred until the INSERT has committed, so the worker can
+    # never look the post up before it is visible, even inside a transaction
+    with transaction.atomic():
+        generated_post = GeneratedPost.objects.create(
+            source_url=source_url,
+            original_content='',
+            user_prompt_adjustment=user_prompt_adjustment,
+            linkedin_post='',
+            summary='',
+            business_rationale='',
+            markdown_content='',
+            text_processing=True,
+            images_processing=True
+        )
+        transaction.on_commit(lambda: _start_post_generation(generated_post.id))
+
+    return redirect('generator:result', post_id=generated_post.id)
+
+
+def _start_post_generation(post_id):
+    """
+    Trigger async post generation, recording a failure on the post if it can't start
+
+    Runs as an on_commit callback, after the pending row has been committed.
+    """
+    try:
+        trigger_async_post_generation(post_id)
+    except Exception:
+        GeneratedPost.objects.filter(pk=post_id).update(
+            text_processing=False,
+            images_processing=False,
+            generation_error='Could not start post generation. Please try again.'
+        )
+
+
+def _trigger_in_background(post_id, summary_text):
+    """
+    Run trigger_async_image_generation off the request thread
+
+    On failure the processing flag is cleared so the result page doesn't wait
+    on images that will never arrive.
+    """
+    try:
+        trigger_async_image_generation(post_id, summary_text)
+    except Exception:
+        # Already logged by trigger_async_image_generation
+        GeneratedPost.objects.filter(pk=post_id).update(images_processing=False)
+    finally:
+        # Django only closes connections at the end of a request, so a pool
+        # thread would otherwise hold its own DB connection open indefinitely
+        connection.close()
+
+
+def start_async_image_generation(post_id, summary_text):
+    """
+    Start async image generation without holding up the response where possible
+
+    Inside Lambda the invoke stays on the request path: the container is frozen
+    as soon as the response is returned, so a background thread could be
+    suspended before the invoke is sent. Elsewhere the invoke runs on a worker
+    thread and the user is redirected straight away.
+
+    Raises:
+        Exception: If the invoke (inside Lambda) or the submit fails
+    """
+    if 'AWS_LAMBDA_FUNCTION_NAME' in os.environ:
+        trigger_async_image_generation(post_id, summary_text)
+    else:
+        _TRIGGER_EXECUTOR.submit(_trigger_in_background, post_id, summary_text)
+
+
+def _start_image_generation(post_id, summary_text):
+    """
+    Step 7 of generate_view: trigger async image generation for a committed post
+
+    Runs as an on_commit callback, so the row already exists; a failed trigger
+    can only be recorded by clearing the processing flag.
+    """
+    try:
+        logger.info("About to trigger async image generation for post %s", post_id)
+        start_async_image_generation(post_id, summary_text)
+        logger.info("Started async image generation for post %s", post_id)
+    except Exception as e:
+        logger.error("Failed to trigger async image generation: %s", e)
+        # If async trigger fails, set processing to false so user doesn't wait indefinitely.
+        # Only the flag is written; the article and markdown text just
+        # inserted are not sent again
+        GeneratedPost.objects.filter(pk=post_id).update(images_processing=False)
+
+
 def index_view(request):
     """
     Main page for submitting a URL
@@ -79,6 +259,16 @@ def generate_view(request):
             messages.error(request, 'Please provide a valid URL')
             return redirect('generator:index')
 
+        # Reject anything that is not an http(s) URL before spending the
+        # request's time budget on scraping and generation
+        parsed_url = urlparse(source_url)
+        if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+            messages.error(request, 'Please provide a valid http:// or https:// URL')
+            return redirect('generator:index')
+
+        if settings.ASYNC_TEXT_GENERATION:
+            return _create_pending_post(source_url, user_prompt_adjustment)
+
         # Step 1: Scrape content
         scrape_result = scrape_content(source_url)
         if not scrape_result['success']:
@@ -88,7 +278,7 @@ def generate_view(request):
         scraped_content = scrape_result['content']
 
         # Step 2: Generate AI content
-        ai_generator = AIGenerator()
+        ai_generator = AIGenerator(interactive=True)
         ai_result = ai_generator.generate_text_content(scraped_content, user_prompt_adjustment)
 
         if not ai_result['success']:
@@ -106,36 +296,33 @@ def generate_view(request):
             [url for url in image_urls if url]
         )
 
-        # Step 6: Save to database with async image processing enabled
-        generated_post = GeneratedPost.objects.create(
-            source_url=source_url,
-            original_content=scraped_content,
-            user_prompt_adjustment=user_prompt_adjustment,
-            linkedin_post=generated_data['linkedin_post'],
-            summary=generated_data['summary'],
-            business_rationale=generated_data['business_rationale'],
-            image_url_1=image_urls[0],
-            image_url_2=image_urls[1],
-            markdown_content=markdown_content,
-            images_processing=True  # Re-enable async image processing
-        )
-
-        # Step 7: Trigger async image generation
-        try:
-            logger.info(f"About to trigger async image generation for post {generated_post.id}")
-            trigger_async_image_generation(generated_post.id, generated_data['summary'])
-            logger.info(f"Successfully triggered async image generation for post {generated_post.id}")
-        except Exception as e:
-            logger.error(f"Failed to trigger async image generation: {str(e)}")
-            # If async trigger fails, set processing to false so user doesn't wait indefinitely
-            generated_post.images_processing = False
-            generated_post.save()
+        # Step 6: Save to database with async image processing enabled. Step 7
+        # (the async trigger) is registered to run once the INSERT commits, so
+        # the worker never races a transaction that hasn't finished
+        with transaction.atomic():
+            generated_post = GeneratedPost.objects.create(
+                source_url=source_url,
+                original_content=scraped_content,
+                user_prompt_adjustment=user_prompt_adjustment,
+                linkedin_post=generated_data['linkedin_post'],
+                summary=generated_data['summary'],
+                business_rationale=generated_data['business_rationale'],
+                image_prompt_1=generated_data.get('image_prompt_1'),
+                image_prompt_2=generated_data.get('image_prompt_2'),
+                image_url_1=image_urls[0],
+                image_url_2=image_urls[1],
+                markdown_content=markdown_content,
+                images_processing=True  # Re-enable async image processing
+            )
+            transaction.on_commit(
+                lambda: _start_image_generation(generated_post.id, generated_data['summary'])
+            )
 
         messages.success(request, 'LinkedIn post generated successfully!')
         return redirect('generator:result', post_id=generated_post.id)
 
     except Exception as e:
-        logger.error(f"Error in generate_view: {str(e)}")
+        logger.error("Error in generate_view: %s", e)
         messages.error(request, 'An unexpected error occurred. Please try again.')
         return redirect('generator:index')
 
@@ -144,7 +331,9 @@ def result_view(request, post_id):
     """
     Display the generated content
     """
-    generated_post = get_object_or_404(GeneratedPost, id=post_id)
+    # The page shows the scraped article, so only the markdown export is left
+    # out; deferring original_content would cost a second query
+    generated_post = get_object_or_404(GeneratedPost.objects.defer('markdown_content'), id=post_id)
 
     context = {
         'post': generated_post
@@ -152,15 +341,25 @@ def result_view(request, post_id):
     return render(request, 'generator/result.html', context)
 
 
+def _iter_chunks(text, size=_DOWNLOAD_CHUNK_CHARS):
+    """Yield successive slices of text, each at most size characters long"""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
 def download_markdown_view(request, post_id):
     """
     Download the markdown content as a file
     """
-    generated_post = get_object_or_404(GeneratedPost, id=post_id)
+    generated_post = get_object_or_404(
+        GeneratedPost.objects.only('id', 'markdown_content', 'created_at'),
+        id=post_id
+    )
 
-    # Create HTTP response with markdown content
-    response = HttpResponse(
-        generated_post.markdown_content,
+    # Create HTTP response with markdown content, encoded and sent a chunk at
+    # a time rather than copied into one response body
+    response = StreamingHttpResponse(
+        _iter_chunks(generated_post.markdown_content),
         content_type='text/markdown'
     )
 
@@ -177,19 +376,39 @@ def check_image_status(request, post_id):
     API endpoint to check if image processing is complete
     """
     try:
-        post = get_object_or_404(GeneratedPost, id=post_id)
-
-        return JsonResponse({
-            'images_processing': post.images_processing,
-            'images_completed': not post.images_processing,
-            'image_url_1': post.image_url_1,
-            'image_url_2': post.image_url_2,
-            'images_completed_at': post.images_completed_at.isoformat() if post.images_completed_at else None
+        # Polled every few seconds by the result page, so only the status
+        # columns are selected rather than the whole post
+        try:
+            post = GeneratedPost.objects.values(
+                'text_processing', 'generation_error',
+                'images_processing', 'image_url_1', 'image_url_2', 'images_completed_at'
+            ).get(id=post_id)
+        except GeneratedPost.DoesNotExist:
+            return _OrjsonResponse({'error': 'Post not found'}, status=404)
+
+        response = _OrjsonResponse({
+            'text_processing': post['text_processing'],
+            'generation_error': post['generation_error'],
+            'images_processing': post['images_processing'],
+            'images_completed': not post['images_processing'],
+            'image_url_1': post['image_url_1'],
+            'image_url_2': post['image_url_2'],
+            'images_completed_at': post['images_completed_at'].isoformat() if post['images_completed_at'] else None
         })
 
+        # Once nothing is processing the status only changes on a regenerate,
+        # so let the browser reuse it briefly and answer repeat polls that
+        # send the ETag back with a bodyless 304
+        if not post['text_processing'] and not post['images_processing']:
+            set_response_etag(response)
+            patch_cache_control(response, private=True, max_age=_FINISHED_STATUS_MAX_AGE)
+            return get_conditional_response(request, etag=response['ETag'], response=response)
+
+        return response
+
     except Exception as e:
-        logger.error(f"Error checking image status: {str(e)}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.error("Error checking image status: %s", e)
+        return _OrjsonResponse({'error': str(e)}, status=500)
 
 
 # API endpoint for checking generation status (optional)
@@ -197,30 +416,51 @@ def history_view(request):
     """
     Display all previously generated posts in a table
     """
-    posts = GeneratedPost.objects.all().order_by('-created_at')
+    # Only the columns the table shows are loaded, one page at a time; the
+    # large article and markdown text stays in the DB
+    posts = GeneratedPost.objects.only('id', 'source_url', 'summary', 'created_at').order_by('-created_at')
+    paginator = Paginator(posts, _HISTORY_PAGE_SIZE)
+    page = paginator.get_page(request.GET.get('page'))
 
     context = {
-        'posts': posts
+        'posts': page,
+        'total_posts': paginator.count,
+        'latest_created_at': posts.values_list('created_at', flat=True).first()
     }
     return render(request, 'generator/history.html', context)
 
 
+@require_http_methods(["GET"])
+def history_page_api(request):
+    """
+    API endpoint returning one page of the post history, for incremental loading
+    """
+    posts = GeneratedPost.objects.values('id', 'source_url', 'summary', 'created_at').order_by('-created_at')
+    page = Paginator(posts, _HISTORY_PAGE_SIZE).get_page(request.GET.get('page'))
+
+    return _OrjsonResponse({
+        'posts': list(page),
+        'page': page.number,
+        'next_page': page.next_page_number() if page.has_next() else None,
+    })
+
+
 
 def status_view(request, post_id):
     """
     API endpoint to check generation status (for future async implementation)
     """
     try:
-        generated_post = get_object_or_404(GeneratedPost, id=post_id)
+        generated_post = get_object_or_404(GeneratedPost.objects.only('id', 'created_at'), id=post_id)
 
-        return JsonResponse({
+        return _OrjsonResponse({
             'status': 'completed',
             'post_id': generated_post.id,
             'created_at': generated_post.created_at.isoformat()
         })
 
     except Exception as e:
-        return JsonResponse({
+        return _OrjsonResponse({
             'status': 'error',
             'error': str(e)
         }, status=500)
@@ -232,14 +472,16 @@ def regenerate_single_image(request, post_id):
     API endpoint to regenerate a single image with custom prompt
     """
     try:
-        logger.info(f"Regenerate image request for post {post_id}")
-        logger.info(f"Request method: {request.method}")
-        logger.info(f"Request headers: {dict(request.headers)}")
-        logger.info(f"Request body: {request.body}")
+        logger.info("Regenerate image request for post %s", post_id)
+        logger.info("Request method: %s", request.method)
+        # Only copy the headers and format the raw body when INFO is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Request headers: %s", dict(request.headers))
+            logger.info("Request body: %s", request.body)
 
         # Check request method
         if request.method != 'POST':
-            return JsonResponse({
+            return _OrjsonResponse({
                 'success': False,
                 'error': f'Method {request.method} not allowed. Use POST.'
             }, status=405)
@@ -250,22 +492,22 @@ def regenerate_single_image(request, post_id):
         model_type = data.get('model_type', 'nova')  # 'nova' or 'titan'
         image_number = int(data.get('image_number', 1))  # 1 or 2
 
-        logger.info(f"Parsed data - prompt: {prompt_text[:50]}..., model: {model_type}, number: {image_number}")
+        logger.info("Parsed data - prompt: %s..., model: %s, number: %s", prompt_text[:50], model_type, image_number)
 
         if not prompt_text:
-            return JsonResponse({
+            return _OrjsonResponse({
                 'success': False,
                 'error': 'Prompt text is required'
             }, status=400)
 
         if model_type not in ['nova', 'titan']:
-            return JsonResponse({
+            return _OrjsonResponse({
                 'success': False,
                 'error': 'Invalid model type. Must be "nova" or "titan"'
             }, status=400)
 
         if image_number not in [1, 2]:
-            return JsonResponse({
+            return _OrjsonResponse({
                 'success': False,
                 'error': 'Invalid image number. Must be 1 or 2'
             }, status=400)
@@ -274,7 +516,7 @@ def regenerate_single_image(request, post_id):
         post = get_object_or_404(GeneratedPost, id=post_id)
 
         # Generate single image
-        ai_generator = AIGenerator()
+        ai_generator = AIGenerator(interactive=True)
         image_result = ai_generator.generate_single_image(prompt_text, model_type)
 
         if image_result['success'] and image_result['image']:
@@ -287,21 +529,28 @@ def regenerate_single_image(request, post_id):
 
             if upload_result['success']:
                 # Update the corresponding image URL and prompt in the database
+                old_url = post.image_url_1 if image_number == 1 else post.image_url_2
                 if image_number == 1:
                     post.image_url_1 = upload_result['url']
                     post.image_prompt_1 = prompt_text
                 else:
                     post.image_url_2 = upload_result['url']
                     post.image_prompt_2 = prompt_text
+                update_fields = [f'image_url_{image_number}', f'image_prompt_{image_number}']
 
-                # Update markdown content with new image URLs
+                # Update markdown content with new image URLs. Replacing an
+                # image only swaps its URL in the existing markdown; the full
+                # document is rendered when the image is new
                 image_urls = []
                 if post.image_url_1:
                     image_urls.append(post.image_url_1)
                 if post.image_url_2:
                     image_urls.append(post.image_url_2)
 
-                if image_urls:
+                if old_url and old_url in post.markdown_content:
+                    post.markdown_content = post.markdown_content.replace(old_url, upload_result['url'], 1)
+                    update_fields.append('markdown_content')
+                elif image_urls:
                     post.markdown_content = ai_generator.create_markdown_content(
                         {
                             'linkedin_post': post.linkedin_post,
@@ -310,12 +559,14 @@ def regenerate_single_image(request, post_id):
                         },
                         image_urls
                     )
+                    update_fields.append('markdown_content')
 
-                post.save()
+                # Write only the changed columns, not the large article text
+                post.save(update_fields=update_fields)
 
-                logger.info(f"Successfully regenerated image {image_number} for post {post_id} using {model_type}")
+                logger.info("Successfully regenerated image %s for post %s using %s", image_number, post_id, model_type)
 
-                return JsonResponse({
+                return _OrjsonResponse({
                     'success': True,
                     'image_url': upload_result['url'],
                     'prompt': prompt_text,
@@ -323,26 +574,26 @@ def regenerate_single_image(request, post_id):
                     'image_number': image_number
                 })
             else:
-                logger.error(f"Failed to upload regenerated image: {upload_result['error']}")
-                return JsonResponse({
+                logger.error("Failed to upload regenerated image: %s", upload_result['error'])
+                return _OrjsonResponse({
                     'success': False,
                     'error': f'Failed to upload image: {upload_result["error"]}'
                 }, status=500)
         else:
-            logger.error(f"Failed to generate image: {image_result['error']}")
-            return JsonResponse({
+            logger.error("Failed to generate image: %s", image_result['error'])
+            return _OrjsonResponse({
                 'success': False,
                 'error': f'Failed to generate image: {image_result["error"]}'
             }, status=500)
 
     except json.JSONDecodeError:
-        return JsonResponse({
+        return _OrjsonResponse({
             'success': False,
             'error': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
-        logger.error(f"Error in regenerate_single_image: {str(e)}")
-        return JsonResponse({
+        logger.error("Error in regenerate_single_image: %s", e)
+        return _OrjsonResponse({
             'success': False,
             'error': f'Server error: {str(e)}'
         }, status=500)
@@ -2,65 +2,87 @@
 Custom Lambda handler that can handle both Django requests and async image processing
 """
 
-import json
+import base64
 import logging
 import os
 
+import django
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Bootstrap Django and build the WSGI application once per container, during
+# the init phase; warm invocations only dispatch
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.core.wsgi import get_wsgi_application
+from zappa.wsgi import create_wsgi_request
+
+from async_handler import process_images_async
+
+_APPLICATION = get_wsgi_application()
+
+# Response content types returned to API Gateway as plain text; anything else
+# is base64-encoded
+_TEXT_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+
 
 def lambda_handler(event, context):
     """
     Main Lambda handler that routes to appropriate processing
     """
-    logger.info(f"Lambda handler called with event keys: {list(event.keys()) if isinstance(event, dict) else 'not dict'}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Lambda handler called with event keys: %s", list(event.keys()) if isinstance(event, dict) else 'not dict')
 
     # Check if this is an async image processing request
     # The event structure for direct Lambda invoke is different than API Gateway
     if isinstance(event, dict) and event.get('action') == 'process_images':
         # This is an async image processing request
-        logger.info(f"MAIN HANDLER: Detected async image processing request: {event}")
-
-        # Setup Django for async processing
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-        import django
-        django.setup()
-
-        from async_handler import process_images_async
+        logger.info("MAIN HANDLER: Detected async image processing request: %s", event)
         return process_images_async(event, context)
 
     # Otherwise, handle as a normal Django web request using Zappa's default handler
     logger.info("Handling as Django web request")
 
-    # Import and use the standard Django WSGI application through Zappa
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
-    import django
-    django.setup()
-
-    from django.core.wsgi import get_wsgi_application
-    application = get_wsgi_application()
-
     # Use Zappa to handle the WSGI request
-    from zappa.wsgi import create_wsgi_request
     environ = create_wsgi_request(event, script_name='', base64_content_types=set(), text_content_types=set())
 
-    from io import StringIO
-    from django.http import HttpResponse
+    response_start = {}
 
     def start_response(status, headers, exc_info=None):
-        pass
-
-    response_data = application(environ, start_response)
-
-    # Convert WSGI response to Lambda format
-    status_code = 200
-    body = b''.join(response_data).decode('utf-8')
-
-    return {
-        'statusCode': status_code,
-        'body': body,
-        'headers': {
-            'Content-Type': 'text/html'
-        }
-    }
\ No newline at end of file
+        response_start['status'] = status
+        response_start['headers'] = headers
+
+    response_data = _APPLICATION(environ, start_response)
+
+    # Collect the body into one buffer, always closing the WSGI iterator so
+    # Django's request_finished cleanup (e.g. closing DB connections) runs
+    body = bytearray()
+    try:
+        for chunk in response_data:
+            body.extend(chunk)
+    finally:
+        if hasattr(response_data, 'close'):
+            response_data.close()
+
+    # Convert WSGI response to Lambda format. multiValueHeaders keeps every
+    # Set-Cookie header (session, CSRF, messages) instead of only the last
+    multi_value_headers = {}
+    for name, value in response_start['headers']:
+        multi_value_headers.setdefault(name, []).append(value)
+
+    response = {
+        'statusCode': int(response_start['status'].split(' ', 1)[0]),
+        'multiValueHeaders': multi_value_headers,
+    }
+
+    content_type = multi_value_headers.get('Content-Type', [''])[0]
+    if content_type.startswith(_TEXT_CONTENT_TYPES) or not body:
+        response['body'] = body.decode('utf-8')
+    else:
+        # Binary bodies (e.g. images) go through API Gateway as base64
+        response['body'] = base64.b64encode(body).decode('ascii')
+        response['isBase64Encoded'] = True
+
+    return response